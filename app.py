@@ -1,11 +1,16 @@
 import os
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+import threading
+import time
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, abort
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
 from ml.meal_recommender import recommend_meals
 from ml.nutrient_analyzer import analyze_selected_meals,get_all_foods,analyze_meal_text
+from ml.diet_filters import DietIndex, FILTERS, parse_filters
 
 load_dotenv()  # loads .env if present
 APP_ID = os.getenv("NUTRITIONIX_APP_ID")
@@ -15,8 +20,14 @@ API_KEY = os.getenv("NUTRITIONIX_API_KEY")
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key')
 basedir = os.path.abspath(os.path.dirname(__file__))
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(basedir, 'database.db')
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get(
+    'DATABASE_URL', 'sqlite:///' + os.path.join(basedir, 'database.db'))
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# seconds a loaded user stays in the per-process cache (0 disables it);
+# writes only invalidate the writing process, so keep this short
+app.config['USER_CACHE_TTL'] = int(os.environ.get('USER_CACHE_TTL', 30))
+# serve user cache hit-rate stats at /cache_stats (off by default)
+app.config['USER_CACHE_STATS'] = os.environ.get('USER_CACHE_STATS', '0') == '1'
 
 db = SQLAlchemy(app)
 login_manager = LoginManager()
@@ -53,9 +64,91 @@ with app.app_context():
  db.create_all()
 
 # ---------- Login ----------
+class UserCache:
+    """
+    Small per-process cache of User rows so login_required routes don't
+    query SQLite on every request. Entries expire after USER_CACHE_TTL
+    seconds and are dropped whenever the user row is updated or deleted.
+    """
+    def __init__(self, ttl, max_size=10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.invalidations = 0
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            if entry:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+
+    def put(self, user_id, user):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if len(self._entries) >= self.max_size:
+                self._entries.clear()
+            self._entries[user_id] = (time.monotonic() + self.ttl, user)
+
+    def invalidate(self, user_id=None):
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+            self.invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+user_cache = UserCache(app.config['USER_CACHE_TTL'])
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _invalidate_cached_user(mapper, connection, target):
+    # profile / password changes must not be served from a stale copy;
+    # this only reaches the current process, other workers wait for the TTL
+    user_cache.invalidate(target.id)
+    # drop it again after commit: a concurrent request may have cached the
+    # old committed row between this flush and the commit
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('changed_user_ids', set()).add(target.id)
+
+@event.listens_for(db.session, 'after_commit')
+@event.listens_for(db.session, 'after_rollback')
+def _invalidate_committed_users(session):
+    for user_id in session.info.pop('changed_user_ids', ()):
+        user_cache.invalidate(user_id)
+
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    user_id = int(user_id)
+    cached = user_cache.get(user_id)
+    if cached is None:
+        user = User.query.get(user_id)
+        if user is None:
+            return None
+        # keep a detached copy; each request gets its own session-bound instance
+        db.session.expunge(user)
+        user_cache.put(user_id, user)
+        cached = user
+    return db.session.merge(cached, load=False)
 
 # ---------- Routes ----------
 @app.route('/')
@@ -131,6 +224,16 @@ def create_plan():
         target_protein = float(request.form.get('target_protein', 75))
         target_carbs = float(request.form.get('target_carbs', 250))
         target_fat = float(request.form.get('target_fat', 70))
+        try:
+            filters = parse_filters(request.form.getlist('diet_filters'))
+        except ValueError as e:
+            flash(str(e), 'danger')
+            return redirect(url_for('create_plan'))
+        # plan from catalog dishes (per 100 g) matching the diet filters
+        candidates = load_diet_index().candidates(filters)
+        if not candidates:
+            flash('No dishes match the selected dietary filters. Try fewer filters.', 'warning')
+            return redirect(url_for('create_plan'))
 
         # call recommender - returns dict with meals
         recommendation = recommend_meals(
@@ -140,8 +243,10 @@ def create_plan():
             target_calories=target_calories,
             target_protein=target_protein,
             target_carbs=target_carbs,
-            target_fat=target_fat
+            target_fat=target_fat,
+            candidates=candidates
         )
+        recommendation['filters'] = filters
 
         plan = DietPlan(
             user_id=current_user.id,
@@ -160,7 +265,7 @@ def create_plan():
         flash('Plan created successfully', 'success')
         return render_template('view_plan.html', plan=recommendation, bmi=calculate_bmi(weight, height))
     # GET
-    return render_template('create_plan.html')
+    return render_template('create_plan.html', diet_filters=FILTERS)
 
 @app.route('/view_plan/<int:plan_id>')
 @login_required
@@ -223,23 +328,68 @@ def analyze_meals_route():
         meal_types=meal_types
     )
 
+@app.route('/cache_stats')
+@login_required
+def cache_stats():
+    if not app.config['USER_CACHE_STATS']:
+        abort(404)
+    return jsonify({"user_cache": user_cache.stats()})
+
 @app.route('/food_search')
 @login_required
 def food_search_api():
-    import pandas as pd
     q = request.args.get('q', '').strip().lower()
     if not q:
         return jsonify([])
-
-    df = pd.read_csv("Indian_Food_Nutrition_Processed.csv")
-    df.columns = [c.strip().lower() for c in df.columns]
-    if "food" not in df.columns:
-        df.rename(columns={"dish name": "food"}, inplace=True)
-
-    results = df[df["food"].str.lower().str.contains(q, na=False)].head(10)
+    try:
+        filters = parse_filters(request.args.getlist('filter'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    df = load_food_catalog()
+    if filters:
+        df = df.iloc[load_diet_index().positions(filters)]
+    results = df[df["food_lower"].str.contains(q, na=False, regex=False)].head(10)
     data = results[['food', 'calories', 'protein', 'carbs', 'fat']].to_dict(orient='records')
     return jsonify(data)
 
+# ---------- Food catalog ----------
+CSV_FILE = os.path.join(basedir, "Indian_Food_Nutrition_Processed.csv")
+_food_catalog = None
+
+def load_food_catalog():
+    """
+    Load the nutrition CSV once per process and keep it in memory.
+    Called from wsgi.py in the master so forked workers share the same copy.
+    """
+    global _food_catalog
+    if _food_catalog is None:
+        import pandas as pd
+        df = pd.read_csv(CSV_FILE)
+        df.columns = [c.strip().lower() for c in df.columns]
+        df.rename(columns={
+            "dish name": "food",
+            "calories (kcal)": "calories",
+            "protein (g)": "protein",
+            "carbohydrates (g)": "carbs",
+            "fats (g)": "fat",
+            "free sugar (g)": "sugar",
+            "fibre (g)": "fibre",
+            "sodium (mg)": "sodium",
+        }, inplace=True)
+        df["food_lower"] = df["food"].str.lower()
+        _food_catalog = df
+    return _food_catalog
+
+_diet_index = None
+
+def load_diet_index():
+    """Dietary-filter bitsets over the food catalog, built once per process."""
+    global _diet_index
+    if _diet_index is None:
+        _diet_index = DietIndex(load_food_catalog())
+    return _diet_index
+
 # ---------- Utilities ----------
 def calculate_bmi(weight_kg, height_cm):
     try:
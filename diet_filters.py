@@ -0,0 +1,228 @@
+import re
+
+# ---------- CONFIG ----------
+# Thresholds per 100 g (the CSV's unit), applied when the catalog loads
+LOW_SODIUM_MG = 140
+LOW_SUGAR_G = 5
+HIGH_FIBRE_G = 5
+
+NON_VEG_PATTERN = re.compile(
+    r"\b(chicken|mutton|lamb|beef|pork|ham|bacon|salami|sausage|turkey|meat|keema|kheema|"
+    r"liver|fish|prawns?|shrimps?|crabs?|lobster|tuna|salmon|egg|eggs|omelette|omlet|"
+    r"anda|ande|murgh|gosht|machli|machhli|jhinga|josh|boti|shammi|bolognese|"
+    r"brown stock|white stock|"
+    # egg-based dishes that don't say "egg"
+    r"souffle|meringue|custard|mousse|chiffon|mayonnaise|sponge|swiss roll)\b",
+    re.IGNORECASE,
+)
+VEG_MARKER_PATTERN = re.compile(
+    r"\b(vegetarian|vegeterian|eggless|without eggs?)\b", re.IGNORECASE)
+
+# Exact dish names (lowercased) the name patterns can't tell apart;
+# checked before the patterns
+NON_VEG_DISHES = {
+    "mixed stock",
+    "club sandwich",
+    "classic club sandwich",
+    "danish luncheon sandwich",
+    "consomme au julienne",
+    "consomme au vermicelli",
+    "dry masala chops",
+    "mulligatawny soup",
+    "hawain salad",
+    "queen of pudding",
+}
+
+# Known dishes and their expected vegetarian tag, see check_known_tags()
+KNOWN_TAGS = {
+    "Roghan josh": False,
+    "Shammi kebab": False,
+    "Boti kebab": False,
+    "Brown stock": False,
+    "Club sandwich ": False,
+    "Classic club sandwich": False,
+    "Chicken curry": False,
+    "Egg curry (Anda curry)": False,
+    "Egg nog": False,
+    "Home made egg noodles": False,
+    "Caramel custard (steamed)": False,
+    "Baked custard": False,
+    "Hot cheese souffle": False,
+    "Cold lemon souffle": False,
+    "Lemon meringue pie": False,
+    "Meringue and rice pudding": False,
+    "Chocolate chiffon cake": False,
+    "Queen of pudding": False,
+    "Mulligatawny soup": False,
+    "Hawain salad": False,
+    "Mayonnaise": False,
+    "Mayonnaise without eggs": True,
+    "Vanilla ice cream without egg": True,
+    "Vegetarian club sandwich": True,
+    "Vegetable stock": True,
+    "Soya seekh kebab": True,
+    "Eggless cake": True,
+    "Chocolate eggless cake": True,
+    "Eggplant/Brinjal rice (Vangi bhat)": True,
+    "Paneer curry": True,
+}
+
+# Condiments, spice mixes, preserves and sauces: fine to search for, but
+# not something to plan 100 g portions of. Matched against the end of the
+# dish name, ignoring "(...)" and "in/with ..." clauses.
+CONDIMENT_PATTERN = re.compile(
+    r"(^(pickled|gravy)\b|\b(chutney|pickle|achaa?r|murabba|marmalade|preserves|squash|"
+    r"ketchup|icing|frosting|dressing|stock|(?<!chicken )masala|powder|blend|jam|jelly|sauce|dip|"
+    r"fillings?|paste/puree)$)",
+    re.IGNORECASE,
+)
+
+# filter name -> human readable label (also the order bits are assigned in)
+FILTERS = {
+    "vegetarian": "Vegetarian",
+    "low_sodium": f"Low sodium (≤ {LOW_SODIUM_MG} mg per 100 g)",
+    "low_sugar": f"Low sugar (≤ {LOW_SUGAR_G} g per 100 g)",
+    "high_fibre": f"High fibre (≥ {HIGH_FIBRE_G} g per 100 g)",
+}
+
+
+def is_vegetarian(dish_name):
+    """Name-based tag: the CSV has no diet column, so look for meat/fish/egg words."""
+    name = str(dish_name)
+    key = name.strip().lower()
+    if key in NON_VEG_DISHES:
+        return False
+    if VEG_MARKER_PATTERN.search(name):
+        return True
+    return not NON_VEG_PATTERN.search(name)
+
+
+def is_condiment(dish_name):
+    """True for condiments/spice mixes/sauces that shouldn't be planned as a portion."""
+    head = str(dish_name).split("(")[0]
+    head = re.split(r"\s+(?:in|with)\s+", head, maxsplit=1)[0].strip()
+    return bool(CONDIMENT_PATTERN.search(head))
+
+
+def check_known_tags():
+    """Return the KNOWN_TAGS dishes whose vegetarian tag is wrong (empty when all pass)."""
+    return [name for name, veg in KNOWN_TAGS.items() if is_vegetarian(name) != veg]
+
+
+def parse_filters(values):
+    """
+    Normalize filters from a request: accepts a list and/or comma-separated
+    strings, e.g. ["vegetarian", "low_sodium,high_fibre"].
+    Raises ValueError for unknown filter names.
+    """
+    if isinstance(values, str):
+        values = [values]
+    filters = []
+    for value in values or []:
+        for name in value.split(","):
+            name = name.strip().lower().replace("-", "_")
+            if not name:
+                continue
+            if name not in FILTERS:
+                raise ValueError(f"Unknown diet filter: {name}")
+            if name not in filters:
+                filters.append(name)
+    return filters
+
+
+# ---------- INDEX ----------
+class DietIndex:
+    """
+    Per-dish attribute bitsets over the nutrition catalog.
+
+    Each filter has one Python int where bit i is set if catalog row i
+    qualifies, so any combination of filters is a bitwise AND and the
+    DataFrame is never rescanned after the index is built.
+    """
+
+    def __init__(self, df, name_col="food", sodium_col="sodium",
+                 sugar_col="sugar", fibre_col="fibre"):
+        self.size = len(df)
+        self.all_mask = (1 << self.size) - 1
+        # filter combination -> row positions / planner pool (at most 2 ** len(FILTERS) entries)
+        self._positions = {}
+        self._candidates = {}
+
+        names = df[name_col].tolist()
+        sodium = df[sodium_col].fillna(0).tolist()
+        sugar = df[sugar_col].fillna(0).tolist()
+        fibre = df[fibre_col].fillna(0).tolist()
+
+        tests = {
+            "vegetarian": [is_vegetarian(n) for n in names],
+            "low_sodium": [v <= LOW_SODIUM_MG for v in sodium],
+            "low_sugar": [v <= LOW_SUGAR_G for v in sugar],
+            "high_fibre": [v >= HIGH_FIBRE_G for v in fibre],
+        }
+        self.masks = {}
+        for name, flags in tests.items():
+            mask = 0
+            for i, flag in enumerate(flags):
+                if flag:
+                    mask |= 1 << i
+            self.masks[name] = mask
+
+        # rows the planner may pick from (everything but condiments)
+        self.meal_mask = 0
+        for i, name in enumerate(names):
+            if not is_condiment(name):
+                self.meal_mask |= 1 << i
+
+        # planner-ready rows, in the same shape as meal_recommender.FALLBACK_FOODS;
+        # CSV values are per 100 g, so that is the portion
+        self.foods = [
+            {"name": f"{str(row[name_col]).strip()} (100 g)",
+             "cal": float(row.get("calories", 0) or 0),
+             "protein": float(row.get("protein", 0) or 0),
+             "carbs": float(row.get("carbs", 0) or 0),
+             "fat": float(row.get("fat", 0) or 0)}
+            for row in df.to_dict(orient="records")
+        ]
+
+    def mask(self, filters):
+        """AND together the bitsets for the given filter names."""
+        result = self.all_mask
+        for name in filters or []:
+            result &= self.masks[name]
+        return result
+
+    @staticmethod
+    def _bits(mask):
+        result = []
+        while mask:
+            low = mask & -mask
+            result.append(low.bit_length() - 1)
+            mask ^= low
+        return result
+
+    def positions(self, filters):
+        """
+        Row positions (ascending list, usable with df.iloc) matching every
+        filter. Cached per combination; callers must not modify the list.
+        """
+        key = frozenset(filters or [])
+        cached = self._positions.get(key)
+        if cached is None:
+            cached = self._positions[key] = self._bits(self.mask(key))
+        return cached
+
+    def candidates(self, filters):
+        """Planner candidate pool: non-condiment dishes matching every filter (cached)."""
+        key = frozenset(filters or [])
+        cached = self._candidates.get(key)
+        if cached is None:
+            cached = self._candidates[key] = [
+                self.foods[i] for i in self._bits(self.mask(key) & self.meal_mask)]
+        return cached
+
+
+if __name__ == "__main__":
+    wrong = check_known_tags()
+    if wrong:
+        raise SystemExit(f"Wrong vegetarian tag for: {wrong}")
+    print(f"All {len(KNOWN_TAGS)} known dishes tagged correctly")
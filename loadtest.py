@@ -0,0 +1,375 @@
+"""
+Load-test harness for the Smart Diet Planner.
+
+Replays a request script against the app and reports throughput and
+p50/p95/p99 latency per endpoint. By default it runs in-process through the
+Flask test client against a throwaway SQLite database (DATABASE_URL is
+pointed at a temp file unless already set); pass --url to drive a running
+server instead, in which case load-test users and plans are written to that
+server's database.
+
+Usage:
+    python loadtest.py --users 8 --requests 200
+    python loadtest.py --script traffic.jsonl --users 16
+    python loadtest.py --url http://127.0.0.1:5000 --users 8
+    python loadtest.py --check        # quick in-process smoke check, no load
+
+A script is a JSONL file, one request per line:
+    {"endpoint": "food_search", "method": "GET", "path": "/food_search?q=pan"}
+    {"endpoint": "create_plan", "method": "POST", "path": "/create_plan",
+     "data": {"meals_count": "3", "target_calories": "2000"}}
+Each virtual user logs in first, then walks the script from its own offset.
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlparse
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+CSV_FILE = os.path.join(BASE_DIR, "Indian_Food_Nutrition_Processed.csv")
+
+# Share of each endpoint in the synthetic mix (roughly what production sees)
+DEFAULT_MIX = {
+    "login": 5,
+    "dashboard": 20,
+    "food_search": 50,
+    "analyze_meals": 15,
+    "create_plan": 10,
+}
+
+
+# Diet filter combinations sent with some search keystrokes
+SEARCH_FILTERS = [["vegetarian"], ["vegetarian", "low_sodium"], ["low_sugar", "high_fibre"]]
+
+
+# ---------- SCRIPT ----------
+def load_dish_names(limit=200):
+    """Read dish names from the nutrition CSV for search/analyze payloads."""
+    try:
+        with open(CSV_FILE, newline="", encoding="utf-8") as f:
+            names = [row["Dish Name"].strip() for row in csv.DictReader(f) if row.get("Dish Name")]
+    except OSError:
+        names = []
+    return names[:limit] or ["paneer", "dal", "rice", "chai"]
+
+
+def synthetic_script(n, seed=0, mix=None):
+    """Build a request script of n entries following the endpoint mix."""
+    rng = random.Random(seed)
+    mix = mix or DEFAULT_MIX
+    endpoints = list(mix)
+    weights = [mix[e] for e in endpoints]
+    dishes = load_dish_names()
+    script = []
+
+    while len(script) < n:
+        endpoint = rng.choices(endpoints, weights)[0]
+        if endpoint == "food_search":
+            # one entry per keystroke, as the autocomplete box sends them
+            word = rng.choice(dishes).lower()
+            filters = rng.choice(SEARCH_FILTERS) if rng.random() < 0.25 else None
+            for i in range(1, min(len(word), 6) + 1):
+                params = {"q": word[:i]}
+                if filters:
+                    params["filter"] = filters
+                script.append({"endpoint": "food_search", "method": "GET",
+                               "path": "/food_search", "params": params})
+        elif endpoint == "analyze_meals":
+            data = {"num_meals": "2",
+                    "meal_food_0[]": rng.sample(dishes, 2),
+                    "meal_drink_0[]": rng.choice(dishes),
+                    "meal_food_1[]": rng.sample(dishes, 2)}
+            script.append({"endpoint": "analyze_meals", "method": "POST",
+                           "path": "/analyze_meals", "data": data})
+        elif endpoint == "create_plan":
+            data = {"plan_name": "Load test plan",
+                    "meals_count": str(rng.randint(2, 5)),
+                    "user_weight": str(rng.randint(50, 100)),
+                    "user_height": str(rng.randint(150, 195)),
+                    "target_calories": str(rng.randint(1500, 3000)),
+                    "target_protein": "75", "target_carbs": "250", "target_fat": "70"}
+            script.append({"endpoint": "create_plan", "method": "POST",
+                           "path": "/create_plan", "data": data})
+        elif endpoint == "login":
+            # credentials are filled in per virtual user
+            script.append({"endpoint": "login", "method": "POST", "path": "/login"})
+        else:
+            script.append({"endpoint": endpoint, "method": "GET", "path": "/" + endpoint})
+
+    return script[:n]
+
+
+def read_script(path):
+    """Read a JSONL request script, skipping blank lines and # comments."""
+    script = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            entry = json.loads(line)
+            if "path" not in entry:
+                continue
+            entry.setdefault("method", "GET")
+            entry.setdefault("endpoint", entry["path"].lstrip("/").split("?")[0].split("/")[0] or "index")
+            script.append(entry)
+    return script
+
+
+# ---------- CLIENTS ----------
+def use_temp_database():
+    """
+    Point the in-process app at a temp SQLite file so runs never touch database.db.
+    Returns the temp file path (None if DATABASE_URL was already set).
+    """
+    path = None
+    if "DATABASE_URL" not in os.environ:
+        fd, path = tempfile.mkstemp(prefix="loadtest-", suffix=".db")
+        os.close(fd)
+        os.environ["DATABASE_URL"] = "sqlite:///" + path
+    import app  # noqa: F401  (create tables once, before the worker threads start)
+    return path
+
+
+class InProcessClient:
+    """Drives the app through the Flask test client (no network, no server)."""
+
+    def __init__(self):
+        from app import app
+        self.client = app.test_client()
+
+    def request(self, method, path, params=None, data=None):
+        """Return (status code, redirect Location or None)."""
+        resp = self.client.open(path, method=method, query_string=params, data=data)
+        resp.get_data()
+        return resp.status_code, resp.headers.get("Location")
+
+
+class HttpClient:
+    """Drives a running server over HTTP with a cookie-keeping session."""
+
+    def __init__(self, base_url):
+        import requests
+        self.base_url = base_url.rstrip("/")
+        self.session = requests.Session()
+
+    def request(self, method, path, params=None, data=None):
+        """Return (status code, redirect Location or None)."""
+        resp = self.session.request(method, self.base_url + path, params=params,
+                                    data=data, allow_redirects=False)
+        return resp.status_code, resp.headers.get("Location")
+
+
+def redirect_path(location):
+    return urlparse(location).path if location else None
+
+
+def is_error(status, location):
+    """4xx/5xx, transport failures, and redirects back to the login page."""
+    if status == 0 or status >= 400:
+        return True
+    return 300 <= status < 400 and redirect_path(location) == "/login"
+
+
+def login(client, email, password):
+    """Register the load-test user if needed, then log in. Raises if login fails."""
+    client.request("POST", "/register",
+                   data={"name": "Load Tester", "email": email, "password": password})
+    client.request("GET", "/logout")
+    status, location = client.request("POST", "/login", data={"email": email, "password": password})
+    if not (300 <= status < 400 and redirect_path(location) == "/dashboard"):
+        raise RuntimeError(f"login failed for {email}: HTTP {status} -> {location}")
+
+
+# ---------- RUNNER ----------
+def run_user(user_id, make_client, script, count, results, lock, ready, failures):
+    email = f"loadtest-{user_id}@example.com"
+    password = "loadtest"
+    try:
+        client = make_client()
+        login(client, email, password)
+    except Exception as e:
+        with lock:
+            failures.append(str(e))
+        return
+    finally:
+        # setup (register + login hashes) stays outside the timed window
+        ready.wait()
+
+    samples = []
+    offset = (user_id * 7919) % len(script)
+    for i in range(count):
+        entry = script[(offset + i) % len(script)]
+        data = entry.get("data")
+        if entry["endpoint"] == "login":
+            data = {"email": email, "password": password}
+        start = time.perf_counter()
+        try:
+            status, location = client.request(entry["method"], entry["path"],
+                                              params=entry.get("params"), data=data)
+        except Exception:
+            status, location = 0, None
+        samples.append((entry["endpoint"], time.perf_counter() - start, is_error(status, location)))
+
+    with lock:
+        results.extend(samples)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+def summarize(results, elapsed):
+    """Group samples per endpoint into count/errors/rps/p50/p95/p99 rows."""
+    by_endpoint = defaultdict(list)
+    for endpoint, latency, failed in results:
+        by_endpoint[endpoint].append((latency, failed))
+    by_endpoint["TOTAL"] = [(lat, failed) for _, lat, failed in results]
+
+    rows = []
+    for endpoint, samples in by_endpoint.items():
+        latencies = sorted(lat for lat, _ in samples)
+        errors = sum(1 for _, failed in samples if failed)
+        rows.append({
+            "endpoint": endpoint,
+            "count": len(samples),
+            "errors": errors,
+            "rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        })
+    rows.sort(key=lambda r: (r["endpoint"] == "TOTAL", r["endpoint"]))
+    return rows
+
+
+def print_report(rows, elapsed, users):
+    print(f"\n{users} users, {elapsed:.2f}s wall time\n")
+    header = f"{'endpoint':<16}{'count':>8}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(f"{r['endpoint']:<16}{r['count']:>8}{r['errors']:>8}{r['rps']:>10}"
+              f"{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}")
+
+
+def run(script, users, requests_per_user, url=None):
+    """
+    Run the load test and return (rows, elapsed_seconds).
+    Raises RuntimeError if any virtual user could not log in.
+    """
+    temp_db = None
+    if url:
+        make_client = lambda: HttpClient(url)
+    else:
+        temp_db = use_temp_database()
+        make_client = InProcessClient
+
+    results = []
+    failures = []
+    lock = threading.Lock()
+    ready = threading.Barrier(users + 1)
+    threads = [threading.Thread(target=run_user,
+                                args=(u, make_client, script, requests_per_user,
+                                      results, lock, ready, failures))
+               for u in range(users)]
+    try:
+        for t in threads:
+            t.start()
+        ready.wait()
+        start = time.perf_counter()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        if temp_db:
+            os.environ.pop("DATABASE_URL", None)
+            os.remove(temp_db)
+
+    if failures:
+        raise RuntimeError("; ".join(failures))
+    return summarize(results, elapsed), elapsed
+
+
+# ---------- SMOKE CHECK ----------
+# (label, method, path, params, data, expected status, check on the JSON body or None)
+SMOKE_CHECKS = [
+    ("search", "GET", "/food_search", {"q": "dal"}, None, 200, lambda body: len(body) > 0),
+    ("filtered search", "GET", "/food_search",
+     {"q": "dal", "filter": ["vegetarian", "low_sodium"]}, None, 200, lambda body: len(body) > 0),
+    ("comma filters", "GET", "/food_search",
+     {"q": "dal", "filter": "vegetarian,low_sodium"}, None, 200, lambda body: len(body) > 0),
+    ("unknown filter", "GET", "/food_search", {"q": "dal", "filter": "bogus"}, None, 400, None),
+    ("filtered plan", "POST", "/create_plan", None,
+     {"meals_count": "2", "diet_filters": ["vegetarian", "low_sugar"]}, 200, None),
+]
+
+
+def smoke_check():
+    """Run SMOKE_CHECKS once through the in-process client; returns the failures."""
+    temp_db = use_temp_database()
+    try:
+        client = InProcessClient()
+        login(client, "loadtest-check@example.com", "loadtest")
+        failures = []
+        for label, method, path, params, data, expected, check in SMOKE_CHECKS:
+            resp = client.client.open(path, method=method, query_string=params, data=data)
+            ok = resp.status_code == expected and (check is None or check(resp.get_json()))
+            print(f"{'ok' if ok else 'FAIL':<6}{label} (HTTP {resp.status_code})")
+            if not ok:
+                failures.append(label)
+        return failures
+    finally:
+        if temp_db:
+            os.environ.pop("DATABASE_URL", None)
+            os.remove(temp_db)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay traffic against the diet planner.")
+    parser.add_argument("--users", type=int, default=4, help="concurrent virtual users")
+    parser.add_argument("--requests", type=int, default=100, help="requests per user")
+    parser.add_argument("--script", help="JSONL request script (synthetic mix if omitted)")
+    parser.add_argument("--url", help="base URL of a running server (in-process if omitted)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the synthetic mix")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--check", action="store_true",
+                        help="run the in-process smoke checks instead of a load test")
+    args = parser.parse_args()
+
+    if args.check:
+        failures = smoke_check()
+        if failures:
+            parser.exit(1, f"smoke check failed: {', '.join(failures)}\n")
+        return
+
+    if args.script:
+        script = read_script(args.script)
+    else:
+        script = synthetic_script(max(args.requests * 2, 200), seed=args.seed)
+    if not script:
+        parser.error("request script is empty")
+
+    try:
+        rows, elapsed = run(script, args.users, args.requests, url=args.url)
+    except RuntimeError as e:
+        parser.exit(1, f"load test aborted: {e}\n")
+    if args.json:
+        print(json.dumps({"users": args.users, "elapsed_s": round(elapsed, 3), "endpoints": rows}, indent=2))
+    else:
+        print_report(rows, elapsed, args.users)
+
+
+if __name__ == "__main__":
+    main()
@@ -25,11 +25,15 @@ FALLBACK_FOODS = [
     {"name":"Broccoli (1 cup)","cal":55,"protein":3.7,"carbs":11,"fat":0.6}
 ]
 
-def recommend_meals(meals_count, weight, height, target_calories, target_protein, target_carbs, target_fat):
+def recommend_meals(meals_count, weight, height, target_calories, target_protein, target_carbs, target_fat,
+                    candidates=None):
     """
     Simple greedy recommender: split targets equally across meals, then fill each meal with items
     from fallback or Nutritionix to meet meal-level targets.
+    `candidates` (same shape as FALLBACK_FOODS) replaces the pool, e.g. dishes matching diet filters.
     """
+    pool = FALLBACK_FOODS if candidates is None else candidates
+    by_protein = sorted(pool, key=lambda f: -f['protein'])
     per_meal_targets = {
         'calories': target_calories / max(1, meals_count),
         'protein': target_protein / max(1, meals_count),
@@ -43,15 +47,15 @@ def recommend_meals(meals_count, weight, height, target_calories, target_protein
         meal_items = []
         current = {'cal':0, 'protein':0, 'carbs':0, 'fat':0}
         tries = 0
-        while (current['cal'] < per_meal_targets['calories']*0.9 or current['protein'] < per_meal_targets['protein']*0.9) and tries < 10:
+        while pool and (current['cal'] < per_meal_targets['calories']*0.9 or current['protein'] < per_meal_targets['protein']*0.9) and tries < 10:
             # pick a candidate from fallback (random pick weighted towards higher protein when protein deficit)
             deficit_protein = per_meal_targets['protein'] - current['protein']
             if deficit_protein > 5:
                 # prefer high-protein items
-                candidates = sorted(FALLBACK_FOODS, key=lambda f: -f['protein'])
+                choices = by_protein
             else:
-                candidates = FALLBACK_FOODS[:]
-            pick = random.choice(candidates)
+                choices = pool
+            pick = random.choice(choices)
             meal_items.append(pick)
             current['cal'] += pick['cal']
             current['protein'] += pick['protein']
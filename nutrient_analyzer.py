@@ -117,14 +117,20 @@ def analyze_meal_text(meal_text):
     form_like = {"meals": [{"meal": x, "drink": ""} for x in items]}
     return analyze_selected_meals(form_like)
 
+_all_foods = None
+
 def get_all_foods():
     """
     Return a sorted list of all unique food items from the dataset.
     Used for populating dropdowns in the HTML form.
+    Built once per process; callers must not modify the returned list.
     """
+    global _all_foods
+    if _all_foods is not None:
+        return _all_foods
     try:
-        foods = sorted(food_df["Dish Name"].dropna().unique().tolist())
-        return foods
+        _all_foods = sorted(food_df["Dish Name"].dropna().unique().tolist())
+        return _all_foods
     except Exception as e:
         print("Error getting food list:", e)
         return []
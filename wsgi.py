@@ -0,0 +1,37 @@
+"""
+Production WSGI entry point.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Importing this module builds the app and loads the nutrition catalog once.
+With preload_app enabled in gunicorn.conf.py this happens in the master, so
+every forked worker shares the same catalog pages copy-on-write.
+"""
+import gc
+
+from app import app, db, load_food_catalog, load_diet_index
+from ml.nutrient_analyzer import get_all_foods
+
+# ---------- PRELOAD (master) ----------
+def preload():
+    """Load everything read-only that workers would otherwise build per process."""
+    load_food_catalog()
+    load_diet_index()
+    get_all_foods()
+    # move preloaded objects out of the tracked generations so the GC in
+    # each worker doesn't touch (and un-share) their pages
+    gc.collect()
+    gc.freeze()
+
+# ---------- WARM-UP (each worker) ----------
+def warm_up():
+    """Per-worker warm-up: fresh DB connections and compiled templates."""
+    with app.app_context():
+        # never reuse connections opened in the master before fork; close=False
+        # leaves the master's connections alone (SQLAlchemy's post-fork pattern)
+        db.engine.dispose(close=False)
+        for name in app.jinja_env.list_templates():
+            if name.endswith(".html"):
+                app.jinja_env.get_template(name)
+
+preload()